@@ -0,0 +1,47 @@
+"""
+build_index.py
+--------------
+Builds the on-disk FAISS index used by the CLI chatbot (src/main.py).
+
+Steps:
+1. Load the PDF
+2. Split into chunks
+3. Build FAISS vector DB (saved to data/faiss_index/)
+4. Run a sample similarity search query
+
+Run from the project root:
+    python scripts/build_index.py
+"""
+
+import os
+import sys
+
+# Make the project root importable so the src package resolves
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.pdf_loader import load_pdf_pages
+from src.chunker import make_chunks
+from src.vector_store import build_vector_store
+
+
+if __name__ == "__main__":
+    print("Loading pages...")
+    pages = load_pdf_pages("data/Arpit_Negi_Resume.pdf")
+    print("Pages:", len(pages))
+
+    print("Chunking...")
+    chunks = make_chunks(pages)
+    print("Chunks:", len(chunks))
+
+    print("Building FAISS vector store...")
+    vectordb = build_vector_store(chunks)
+    print("Vector store saved!")
+
+    # Simple search test
+    query = "ML Developer having 3 year experience in Python and Data Science?"
+    results = vectordb.similarity_search(query, k=3)
+
+    for i, doc in enumerate(results, 1):
+        print(f"\n--- Result {i} ---")
+        print(doc.metadata)
+        print(doc.page_content[:300], "\n")
@@ -7,34 +7,43 @@ Exposes the RAG pipeline as a RESTful API.
 Endpoints:
 - POST /extract-skills: Extract skills from a resume PDF
 - POST /evaluate-ats: Evaluate ATS score against a job description
+- POST /analyze-resume: Skills extraction + ATS evaluation in one request
+- POST /analyze-resumes: Skills + ATS for many resumes against one job description
 - GET /health: Health check endpoint
 """
 
 import os
-from typing import Dict, Any
+from contextlib import asynccontextmanager
+from typing import Any, List
 
-from fastapi import FastAPI, UploadFile, File, Form, HTTPException
+import orjson
+
+from fastapi import APIRouter, FastAPI, UploadFile, File, Form, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 
-from dotenv import load_dotenv
+# PDF loader is light; the RAG chain (LangChain, Gemini, FAISS) is imported
+# lazily inside the endpoints so the API starts (and --reload restarts) fast
+from .pdf_loader import extract_text_from_pdf_stream
+
 
-# Load environment variables
-load_dotenv()
+# All endpoints are registered on this router and mounted by create_app()
+router = APIRouter()
 
-# Import core RAG functions (relative imports)
-from .rag_chain import extract_skills_only, evaluate_ats_only
-from .pdf_loader import extract_text_from_pdf_bytes
 
+# ==================== JSON RESPONSE ====================
 
+class ORJSONResponse(JSONResponse):
+    """
+    JSON response encoded with orjson (much faster than stdlib json).
 
-# ==================== FASTAPI APP INITIALIZATION ====================
+    Defined here instead of importing fastapi.responses.ORJSONResponse,
+    which current FastAPI releases deprecate (a warning on every response).
+    """
 
-app = FastAPI(
-    title="Resume ATS Analyzer API",
-    description="RAG-based resume analysis against job descriptions",
-    version="1.0.0"
-)
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
 
 
 # ==================== RESPONSE MODELS ====================
@@ -63,15 +72,37 @@ class AtsResponse(BaseModel):
     suggestions: list
 
 
+class AnalysisResponse(BaseModel):
+    """Combined skills extraction + ATS evaluation response"""
+    extracted_skills: list
+    ats_result: AtsResponse
+
+
+class BatchAnalysisResponse(BaseModel):
+    """Per-resume analysis results, in upload order"""
+    results: List[AnalysisResponse]
+
+
 class ErrorResponse(BaseModel):
     """Error response"""
     error: str
     details: str = ""
 
 
+# ==================== HELPERS ====================
+
+def _upload_is_empty(upload: UploadFile) -> bool:
+    """Check whether an uploaded file has no content, without reading it into memory."""
+    stream = upload.file
+    stream.seek(0, os.SEEK_END)
+    size = stream.tell()
+    stream.seek(0)
+    return size == 0
+
+
 # ==================== ENDPOINTS ====================
 
-@app.get("/health", response_model=HealthResponse, tags=["Health"])
+@router.get("/health", response_model=HealthResponse, tags=["Health"])
 async def health_check():
     """
     Health check endpoint.
@@ -86,15 +117,15 @@ async def health_check():
     )
 
 
-@app.post("/extract-skills", response_model=SkillsResponse, tags=["Analysis"])
+@router.post("/extract-skills", responses={200: {"model": SkillsResponse}}, tags=["Analysis"])
 async def extract_skills_endpoint(
     resume: UploadFile = File(..., description="Resume PDF file")
-) -> Dict[str, Any]:
+) -> ORJSONResponse:
     """
     Extract skills from a resume.
     
     Process:
-    1. Read uploaded PDF file into bytes (in-memory, no disk storage)
+    1. Stream the uploaded PDF file (no extra in-memory copy)
     2. Extract text from PDF
     3. Extract skills using RAG pipeline
     4. Return extracted skills only
@@ -103,41 +134,41 @@ async def extract_skills_endpoint(
         resume: Uploaded PDF file
     
     Returns:
-        Dict with extracted_skills list
+        JSON response with extracted_skills list
     
     Raises:
         HTTPException: If PDF extraction fails or analysis errors occur
     """
     
     try:
-        # Read PDF file bytes (in-memory, no disk I/O)
-        pdf_bytes = await resume.read()
-        
-        if not pdf_bytes:
+        # Parse straight from the upload's spooled file (no full copy into bytes)
+        if await run_in_threadpool(_upload_is_empty, resume):
             raise HTTPException(
                 status_code=400,
                 detail="Resume file is empty"
             )
         
-        # Extract text from PDF
+        # Extract text from PDF (CPU-bound -> worker thread, keeps the event loop free)
         try:
-            resume_text = extract_text_from_pdf_bytes(pdf_bytes)
+            resume_text = await run_in_threadpool(extract_text_from_pdf_stream, resume.file)
         except ValueError as e:
             raise HTTPException(
                 status_code=400,
                 detail=str(e)
             )
         
-        # Extract skills
+        # Extract skills (blocking Gemini calls -> worker thread)
+        from .rag_chain import extract_skills_only
         try:
-            result = extract_skills_only(resume_text)
+            result = await run_in_threadpool(extract_skills_only, resume_text)
         except ValueError as e:
             raise HTTPException(
                 status_code=400,
                 detail=str(e)
             )
         
-        return result
+        # Our own pipeline output -> skip response_model re-validation
+        return ORJSONResponse(result)
     
     except HTTPException:
         # Re-raise HTTP exceptions
@@ -150,16 +181,16 @@ async def extract_skills_endpoint(
         )
 
 
-@app.post("/evaluate-ats", response_model=AtsResponse, tags=["Analysis"])
+@router.post("/evaluate-ats", responses={200: {"model": AtsResponse}}, tags=["Analysis"])
 async def evaluate_ats_endpoint(
     resume: UploadFile = File(..., description="Resume PDF file"),
     job_description: str = Form(..., description="Job description text")
-) -> Dict[str, Any]:
+) -> ORJSONResponse:
     """
     Evaluate ATS score of a resume against a job description.
     
     Process:
-    1. Read uploaded PDF file into bytes (in-memory, no disk storage)
+    1. Stream the uploaded PDF file (no extra in-memory copy)
     2. Extract text from PDF
     3. Run ATS evaluation against job description
     4. Return ATS scores and recommendations
@@ -169,7 +200,7 @@ async def evaluate_ats_endpoint(
         job_description: Job description to compare against
     
     Returns:
-        Dict with ATS scores, missing skills, weak areas, and suggestions
+        JSON response with ATS scores, missing skills, weak areas, and suggestions
     
     Raises:
         HTTPException: If PDF extraction fails, inputs are invalid, or analysis errors occur
@@ -183,34 +214,183 @@ async def evaluate_ats_endpoint(
         )
     
     try:
-        # Read PDF file bytes (in-memory, no disk I/O)
-        pdf_bytes = await resume.read()
+        # Parse straight from the upload's spooled file (no full copy into bytes)
+        if await run_in_threadpool(_upload_is_empty, resume):
+            raise HTTPException(
+                status_code=400,
+                detail="Resume file is empty"
+            )
+        
+        # Extract text from PDF (CPU-bound -> worker thread, keeps the event loop free)
+        try:
+            resume_text = await run_in_threadpool(extract_text_from_pdf_stream, resume.file)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=400,
+                detail=str(e)
+            )
         
-        if not pdf_bytes:
+        # Evaluate ATS (blocking Gemini calls -> worker thread)
+        from .rag_chain import evaluate_ats_only
+        try:
+            result = await run_in_threadpool(evaluate_ats_only, resume_text, job_description)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=400,
+                detail=str(e)
+            )
+        
+        # Our own pipeline output -> skip response_model re-validation
+        return ORJSONResponse(result)
+    
+    except HTTPException:
+        # Re-raise HTTP exceptions
+        raise
+    except Exception as e:
+        # Catch unexpected errors
+        raise HTTPException(
+            status_code=500,
+            detail=f"Internal server error: {str(e)}"
+        )
+
+
+@router.post("/analyze-resume", responses={200: {"model": AnalysisResponse}}, tags=["Analysis"])
+async def analyze_resume_endpoint(
+    resume: UploadFile = File(..., description="Resume PDF file"),
+    job_description: str = Form(..., description="Job description text")
+) -> ORJSONResponse:
+    """
+    Extract skills AND evaluate ATS score in a single request.
+    
+    Process:
+    1. Stream the uploaded PDF file (no extra in-memory copy)
+    2. Extract text from PDF
+    3. Run skills extraction and ATS evaluation in one pipeline run
+       (shared FAISS store; the two Gemini round-trips overlap)
+    4. Return both results
+    
+    Args:
+        resume: Uploaded PDF file
+        job_description: Job description to compare against
+    
+    Returns:
+        JSON response with extracted_skills list and ats_result dict
+    
+    Raises:
+        HTTPException: If PDF extraction fails, inputs are invalid, or analysis errors occur
+    """
+    
+    # Validate job description
+    if not job_description or not job_description.strip():
+        raise HTTPException(
+            status_code=400,
+            detail="Job description cannot be empty"
+        )
+    
+    try:
+        # Parse straight from the upload's spooled file (no full copy into bytes)
+        if await run_in_threadpool(_upload_is_empty, resume):
             raise HTTPException(
                 status_code=400,
                 detail="Resume file is empty"
             )
         
-        # Extract text from PDF
+        # Extract text from PDF (CPU-bound -> worker thread, keeps the event loop free)
         try:
-            resume_text = extract_text_from_pdf_bytes(pdf_bytes)
+            resume_text = await run_in_threadpool(extract_text_from_pdf_stream, resume.file)
         except ValueError as e:
             raise HTTPException(
                 status_code=400,
                 detail=str(e)
             )
         
-        # Evaluate ATS
+        # Skills + ATS (one retrieval setup, LLM calls overlap inside)
+        from .rag_chain import analyze_resume
         try:
-            result = evaluate_ats_only(resume_text, job_description)
+            result = await run_in_threadpool(analyze_resume, resume_text, job_description)
         except ValueError as e:
             raise HTTPException(
                 status_code=400,
                 detail=str(e)
             )
         
-        return result
+        # Our own pipeline output -> skip response_model re-validation
+        return ORJSONResponse(result)
+    
+    except HTTPException:
+        # Re-raise HTTP exceptions
+        raise
+    except Exception as e:
+        # Catch unexpected errors
+        raise HTTPException(
+            status_code=500,
+            detail=f"Internal server error: {str(e)}"
+        )
+
+
+@router.post("/analyze-resumes", responses={200: {"model": BatchAnalysisResponse}}, tags=["Analysis"])
+async def analyze_resumes_endpoint(
+    resumes: List[UploadFile] = File(..., description="Resume PDF files"),
+    job_description: str = Form(..., description="Job description text")
+) -> ORJSONResponse:
+    """
+    Extract skills AND evaluate ATS score for many resumes in one request.
+    
+    Process:
+    1. Extract text from every uploaded PDF (in parallel worker threads)
+    2. Score all resumes in one batched pipeline run (shared FAISS index,
+       one batched LLM call)
+    3. Return one result per resume, in upload order
+    
+    Args:
+        resumes: Uploaded PDF files
+        job_description: Job description to compare against
+    
+    Returns:
+        JSON response with a results list of {extracted_skills, ats_result}
+    
+    Raises:
+        HTTPException: If PDF extraction fails, inputs are invalid, or analysis errors occur
+    """
+    
+    # Validate job description
+    if not job_description or not job_description.strip():
+        raise HTTPException(
+            status_code=400,
+            detail="Job description cannot be empty"
+        )
+    
+    try:
+        for resume in resumes:
+            if await run_in_threadpool(_upload_is_empty, resume):
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Resume file '{resume.filename}' is empty"
+                )
+        
+        # Extract text from the PDFs one after another (PDFium is not thread-safe)
+        try:
+            resume_texts = []
+            for resume in resumes:
+                resume_texts.append(await run_in_threadpool(extract_text_from_pdf_stream, resume.file))
+        except ValueError as e:
+            raise HTTPException(
+                status_code=400,
+                detail=str(e)
+            )
+        
+        # One batched run for all resumes (blocking Gemini calls -> worker thread)
+        from .rag_chain import analyze_resumes_batch
+        try:
+            results = await run_in_threadpool(analyze_resumes_batch, resume_texts, job_description)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=400,
+                detail=str(e)
+            )
+        
+        # Our own pipeline output -> skip response_model re-validation
+        return ORJSONResponse({"results": results})
     
     except HTTPException:
         # Re-raise HTTP exceptions
@@ -225,10 +405,9 @@ async def evaluate_ats_endpoint(
 
 # ==================== ERROR HANDLERS ====================
 
-@app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc):
     """Handle HTTP exceptions with consistent error format"""
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={
             "error": "Analysis failed",
@@ -239,9 +418,9 @@ async def http_exception_handler(request, exc):
 
 # ==================== STARTUP/SHUTDOWN ====================
 
-@app.on_event("startup")
-async def startup_event():
-    """Log startup information"""
+@asynccontextmanager
+async def lifespan(application: FastAPI):
+    """Log startup information, then serve until shutdown"""
     print("=" * 70)
     print("Resume ATS Analyzer API - Starting")
     print("=" * 70)
@@ -249,16 +428,43 @@ async def startup_event():
     print("✓ Endpoints available:")
     print("  - POST /extract-skills (Extract skills from resume)")
     print("  - POST /evaluate-ats (Evaluate ATS score)")
+    print("  - POST /analyze-resume (Skills + ATS score in one call)")
+    print("  - POST /analyze-resumes (Skills + ATS score for many resumes)")
     print("  - GET /health (Health check)")
     print("  - GET /docs (API documentation)")
     print("=" * 70)
+    yield
+
+
+# ==================== APP FACTORY ====================
+
+def create_app() -> FastAPI:
+    """
+    Build the FastAPI application.
+    
+    Returns:
+        App with all endpoints, the error handler and the lifespan hook registered
+    """
+    application = FastAPI(
+        title="Resume ATS Analyzer API",
+        description="RAG-based resume analysis against job descriptions",
+        version="1.0.0",
+        default_response_class=ORJSONResponse,  # orjson: much faster JSON encoding than stdlib json
+        lifespan=lifespan
+    )
+    application.include_router(router)
+    application.add_exception_handler(HTTPException, http_exception_handler)
+    return application
+
+
+# Module-level instance used by uvicorn (src.api:app)
+app = create_app()
 
 
 # ==================== ENTRY POINT ====================
 
 if __name__ == "__main__":
     import uvicorn
-    import os
 
     port = int(os.getenv("PORT", 8000))
     # Run with: python -m uvicorn src.api:app --reload --host 0.0.0.0 --port 8000
@@ -12,11 +12,19 @@ def make_chunks(
     pages_text: List[str],
     chunk_size: int = 500,
     chunk_overlap: int = 50,
+    source: str = "Arpit_Negi_Resume.pdf",
 ) -> List[Document]: 
     # chunk_size:- maximum characters in each chunk
     # chunk_overlap:- how many characters new chunk share with the previous one
+    # source:- file name stored in every chunk's metadata
     # The function will return a list of Document objects, each object will represent chunks
 
+    step = chunk_size - chunk_overlap
+    # How far the window moves each time
+    if step <= 0:
+        raise ValueError("chunk_overlap must be smaller than chunk_size")
+        # Otherwise the window would never move forward
+
     chunks: List[Document] = []
     # Empty list of Documents
 
@@ -29,24 +37,17 @@ def make_chunks(
         # Clean up page text a bit
         text = page_text.strip()
 
-        start = 0
-        text_length = len(text)
+        page_meta = {"page": i+1, "source": source}
+        # One metadata dict per page, shared by all of its chunks
+        # Metadata contains page number and source
 
         # Sliding window over the text
-        while(start < text_length):
-            end = start + chunk_size
-            chunk_text = text[start:end]
-
-            # Create a document for this chunk
-            doc = Document(
-                    page_content=chunk_text,
-                    metadata={"page": i+1, "source": "Arpit_Negi_Resume.pdf"},
-            )
-            # Creating a document that contains chunk content
-            # Metadata contains page number and source
-            chunks.append(doc)
-
-            start += chunk_size - chunk_overlap
+        # range() precomputes every window start in C, no Python-level while loop
+        chunks.extend(
+            Document(page_content=text[start:start + chunk_size], metadata=page_meta)
+            for start in range(0, len(text), step)
+        )
+        # Creating a document for each chunk that contains the chunk content
     
     return chunks
 
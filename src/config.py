@@ -0,0 +1,22 @@
+"""
+config.py
+---------
+Environment configuration, read once per process.
+
+The .env file is parsed on the first import of this module only (Python
+caches modules), and the Gemini API key is kept as a module constant
+instead of being looked up on every call.
+"""
+
+import os
+
+# Read environment variables from .env file (variables already set win)
+from dotenv import load_dotenv
+load_dotenv()
+
+
+# ------------------ SETTINGS ------------------
+
+# None if unset: callers raise ValueError when they actually need the key,
+# so the API can still start (and answer /health) without one
+GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
@@ -1,34 +1,160 @@
-from typing import List
+from typing import BinaryIO, List, Union
 # to use type hints
-from pypdf import PdfReader
-# to open and read PDF file to extract texts
-import io
-# for in-memory file handling
+import os
+import threading
+# to serialise every PDFium call made from this process
+import xxhash
+# to fingerprint uploaded PDFs for the text cache (fast non-cryptographic SIMD hash)
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+# to extract the pages of large PDFs in parallel
+import pypdfium2 as pdfium
+# to open and read PDF file to extract texts (PDFium backend, much faster than pypdf)
+
+try:
+    from .semantic_cache import LRUCache
+except ImportError:
+    # this file is also run directly as a script (python src/pdf_loader.py)
+    from semantic_cache import LRUCache
+
+PdfSource = Union[str, bytes, BinaryIO]
+# A PDF can be given as a file path, raw bytes or a seekable binary file object
+
+_pdfium_lock = threading.Lock()
+# PDFium is not thread-safe, even across separate documents
+# The API reads uploads in a threadpool, so every open/read in this process holds this lock
+
+PARALLEL_PAGE_THRESHOLD = 16
+# PDFs with at least this many pages are split across worker processes
+# Below it (every normal resume) starting processes costs more than it saves
+
+_PAGE_WORKERS = os.cpu_count() or 1
+# Size of the shared page-extraction process pool
+
+_page_pool = None
+_page_pool_lock = threading.Lock()
+# One process pool for the whole process, created on the first large PDF and reused
+# by every upload after it (starting fresh processes per upload is slow)
+
+_text_cache = LRUCache(maxsize=128)
+# Extracted text of recently seen PDFs, keyed by a 128-bit hash of the file content
+# The same resume is usually uploaded again and again against different job descriptions
+
+_HASH_BLOCK_SIZE = 1 << 20
+# Streams are hashed 1 MiB at a time so they are never loaded into memory at once
+
+_PDF_MAGIC = b"%PDF-"
+# The PDF header marker (followed by the version, e.g. %PDF-1.7)
+
+_PDF_HEADER_WINDOW = 1024
+# Readers (PDFium included) accept the header anywhere in the first 1024 bytes,
+# so files with a few leading junk bytes are still PDFs
+# Only a header at the start of a line counts, so a text resume that merely
+# mentions "%PDF" is still read as text
+
+def _page_text(page) -> str:
+    # Extracts the text of a single pdfium page object
+    textpage = page.get_textpage()
+    # A textpage holds the text layer of the page
+    try:
+        text = textpage.get_text_range() or ""
+        # get_text_range() with no arguments returns all text on the page in one call
+        return text.replace("\r\n", "\n")
+        # PDFium separates lines with Windows-style CRLF, normalise to plain newlines
+    finally:
+        textpage.close()
+        page.close()
+        # Release native PDFium handles as soon as we are done with them
+
+def _extract_page_range(source: PdfSource, start: int, stop: int) -> List[str]:
+    # Opens its own copy of the document and returns the stripped text of pages [start, stop)
+    # Runs inside a worker process: PDFium is not thread-safe, so each process gets its own document
+    # Each worker runs one task at a time, so no lock is needed here
+    pdf = pdfium.PdfDocument(source)
+    try:
+        return [_page_text(pdf[i]).strip() for i in range(start, stop)]
+    finally:
+        pdf.close()
+
+def _get_page_pool() -> ProcessPoolExecutor:
+    # Returns the shared worker pool, creating it on first use
+    # "spawn" (not fork): the API calls this from a threadpool thread, and a forked child
+    # would inherit _pdfium_lock in whatever state another thread left it (possibly locked forever)
+    global _page_pool
+    with _page_pool_lock:
+        if _page_pool is None:
+            _page_pool = ProcessPoolExecutor(
+                max_workers=_PAGE_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _page_pool
+
+def _extract_pages(source: PdfSource) -> List[str]:
+    # Returns the stripped text of every page, in page order
+
+    with _pdfium_lock:
+        pdf = pdfium.PdfDocument(source)
+        try:
+            n_pages = len(pdf)
+            if n_pages < PARALLEL_PAGE_THRESHOLD:
+                # Small document -> read every page serially in this process
+                return [_page_text(page).strip() for page in pdf]
+        finally:
+            pdf.close()
+
+    if not isinstance(source, (str, bytes)):
+        # File objects cannot be sent to worker processes, hand them the bytes instead
+        source.seek(0)
+        source = source.read()
+
+    # Large document -> one contiguous batch of pages per worker process
+    workers = min(_PAGE_WORKERS, n_pages)
+    batch = -(-n_pages // workers)
+    # ceiling division so every page belongs to exactly one batch
+    bounds = [(start, min(start + batch, n_pages)) for start in range(0, n_pages, batch)]
+
+    executor = _get_page_pool()
+    futures = [executor.submit(_extract_page_range, source, start, stop) for start, stop in bounds]
+    pages_text: List[str] = []
+    for future in futures:
+        # Collect in submission order so pages stay in document order
+        pages_text.extend(future.result())
+
+    return pages_text
 
 def load_pdf_pages(pdf_path:str) -> List[str]:
     # pdf_path contains the path to the pdf "Lorebook"
     # The function will return a list of string
     # Each element of the list represents the texts of each page
 
-    reader = PdfReader(pdf_path)
-    # creating a reader object that opens the PDF file
-    # reader.pages will have a list-like object the contains the page objects
+    pages_text : List[str] = _extract_pages(pdf_path)
+    # Each element is the text of one page with leading/trailing whitespace stripped
+    # Pages without extractable text give an empty string
+    # Large PDFs are read in parallel, small ones page by page
 
-    pages_text : List[str] = []
-    # Initlializing an empty list
-    # It will be used to store text of each page
+    return pages_text
 
-    for page in reader.pages:
-        text = page.extract_text() or ""
-        # Here, we are calling extract_text() on page object to read text content
-        # Sometimes, they don't have extractable text, so it returns None
-        # So, if it returns None, text becomes an empty string
-        text = text.strip()
-        # strip() removes leading and trailing spaces, newline characters at start and end
-        pages_text.append(text)
-        # Now, add cleaned text to the page_text list
 
-    return pages_text
+def extract_text_from_pdf_stream(stream: BinaryIO) -> str:
+    """
+    Extract text from a PDF file object (e.g. an upload's SpooledTemporaryFile).
+    
+    PDFium reads straight from the stream, so the file is never buffered
+    into a separate bytes object first. Content without a %PDF- header at
+    the start of a line in its first 1 KiB is treated as plain UTF-8 text.
+    
+    Args:
+        stream: Seekable binary file object positioned anywhere
+    
+    Returns:
+        Extracted text as single string (all pages joined with newlines)
+    
+    Raises:
+        ValueError: If PDF extraction fails, no text is found or the file
+                    is neither a PDF nor plain text
+    """
+    stream.seek(0)
+    return _extract_text(stream)
 
 
 def extract_text_from_pdf_bytes(pdf_bytes: bytes) -> str:
@@ -37,6 +163,8 @@ def extract_text_from_pdf_bytes(pdf_bytes: bytes) -> str:
     
     Takes raw PDF file bytes and extracts all text content.
     Joins all pages into a single continuous string.
+    Bytes without a %PDF- header at the start of a line in their first
+    1 KiB are decoded as UTF-8 text.
     
     Args:
         pdf_bytes: Raw PDF file content as bytes
@@ -45,22 +173,84 @@ def extract_text_from_pdf_bytes(pdf_bytes: bytes) -> str:
         Extracted text as single string (all pages joined with newlines)
     
     Raises:
-        ValueError: If PDF extraction fails or no text is found
+        ValueError: If PDF extraction fails, no text is found or the file
+                    is neither a PDF nor plain text
     """
+    # PDFium reads directly from the bytes buffer (no BytesIO copy needed)
+    return _extract_text(pdf_bytes)
+
+
+def _content_digest(source: Union[bytes, BinaryIO]) -> bytes:
+    # XXH3-128 of the PDF content
+    # Cache keys need good distribution, not cryptographic strength, and XXH3 is several times faster than SHA-256
+    if isinstance(source, bytes):
+        return xxhash.xxh3_128_digest(source)
+
+    digest = xxhash.xxh3_128()
+    source.seek(0)
+    for block in iter(lambda: source.read(_HASH_BLOCK_SIZE), b""):
+        digest.update(block)
+    source.seek(0)
+    # Rewind so PDFium reads the stream from the start
+    return digest.digest()
+
+
+def _extract_text(source: Union[bytes, BinaryIO]) -> str:
+    # Shared body of the two public extractors above: all non-empty pages joined into one string
+    # Repeat uploads of the same file are answered from the cache without parsing
+    key = _content_digest(source)
+    cached = _text_cache.get(key)
+    if cached is not None:
+        return cached
+
+    if _is_pdf(source):
+        full_text = _parse_text(source)
+    else:
+        # Plain-text upload (e.g. a .txt resume) -> no PDF parsing at all
+        full_text = _decode_text(source)
+    _text_cache.put(key, full_text)
+    return full_text
+
+
+def _is_pdf(source: Union[bytes, BinaryIO]) -> bool:
+    # Looks for a line-start PDF header in the first _PDF_HEADER_WINDOW bytes
+    if isinstance(source, bytes):
+        head = source[:_PDF_HEADER_WINDOW]
+    else:
+        head = source.read(_PDF_HEADER_WINDOW)
+        source.seek(0)
+
+    return (
+        head.startswith(_PDF_MAGIC)
+        or b"\n" + _PDF_MAGIC in head
+        or b"\r" + _PDF_MAGIC in head
+    )
+
+
+def _decode_text(source: Union[bytes, BinaryIO]) -> str:
+    # Decodes a non-PDF upload as UTF-8 text
+    data = source if isinstance(source, bytes) else source.read()
+
+    if b"\x00" in data:
+        # NUL bytes never appear in text files -> some other binary format (docx, image, ...)
+        raise ValueError("Unsupported file type. Upload a PDF or a plain-text resume.")
+
+    text = data.decode("utf-8", errors="replace").strip()
+    if not text:
+        raise ValueError("No text found in the uploaded file.")
+    return text
+
+
+def _parse_text(source: PdfSource) -> str:
+    # Parses the PDF and joins all non-empty pages into one string
     try:
-        # Create in-memory file object from bytes
-        pdf_file = io.BytesIO(pdf_bytes)
-        reader = PdfReader(pdf_file)
+        all_pages = _extract_pages(source)
         
-        if not reader.pages:
+        if not all_pages:
             raise ValueError("PDF has no pages")
         
-        pages_text: List[str] = []
-        for page in reader.pages:
-            text = page.extract_text() or ""
-            text = text.strip()
-            if text:  # Only add non-empty pages
-                pages_text.append(text)
+        # Only keep non-empty pages
+        pages_text: List[str] = [text for text in all_pages if text]
         
         if not pages_text:
             raise ValueError("No text could be extracted from PDF. Ensure it's a text-based PDF (not image-only).")
@@ -74,8 +264,6 @@ def extract_text_from_pdf_bytes(pdf_bytes: bytes) -> str:
 
 if __name__ == "__main__":
     # will run this block only if you run this file directly
-    import os
-    # used here for path handling
 
     pdf_path = os.path.join("data", "Arpit_Negi_Resume.pdf")
     # Builds the file path
@@ -1,10 +1,196 @@
-import os, json
-from typing import Dict, Any
+from __future__ import annotations
 
-from langchain_google_genai import ChatGoogleGenerativeAI
+import functools
+import orjson
+import xxhash
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Tuple
 
-from dotenv import load_dotenv
-load_dotenv()
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+
+# Heavy modules (langchain-google-genai and its Google client stack, FAISS,
+# the chunker / vector store) are imported inside the functions that use
+# them, so importing this module stays cheap for short-lived processes
+if TYPE_CHECKING:
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
+from .config import GOOGLE_API_KEY
+from .semantic_cache import LRUCache, SemanticCache
+
+
+# ==================== RESPONSE CACHES ====================
+
+# ATS results: exact resume (hash namespace) + semantically similar JD
+# (cosine >= 0.95). Repeats and paraphrased JDs skip retrieval and Gemini.
+_ats_cache = SemanticCache()
+
+# Extracted skills keyed by the resume hash only (they do not depend on the JD)
+_skills_cache = LRUCache(maxsize=256)
+
+# CLI (build_rag_chain) results keyed by the embedding of the question
+_rag_ask_cache = SemanticCache()
+
+# In-memory FAISS stores of long resumes keyed by the resume hash, so
+# skills + several ATS runs on one resume chunk and embed it only once
+_index_cache = LRUCache(maxsize=64)
+
+# Threads for overlapping independent Gemini calls (network-bound, so threads suffice)
+_llm_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="llm")
+
+# Batched LLM calls are grouped into bins of similar prompt length
+# (len // BATCH_BIN_WIDTH, capped at BATCH_NUM_BINS - 1); the bins run
+# concurrently, so the short prompts finish without waiting on a long one
+BATCH_BIN_WIDTH = 1024
+BATCH_NUM_BINS = 4
+
+# Resumes below this many (estimated) tokens are sent to Gemini whole:
+# chunking, embedding and a FAISS search only pay off for long documents
+RETRIEVAL_TOKEN_THRESHOLD = 8000
+CHARS_PER_TOKEN = 4
+
+
+@functools.lru_cache(maxsize=1)
+def _get_llm() -> ChatGoogleGenerativeAI:
+    """
+    Return the process-wide Gemini chat client.
+    
+    Created on first use and then reused, so the HTTP client, connection
+    pool and credentials are set up once instead of on every request.
+    
+    Raises:
+        ValueError: If GOOGLE_API_KEY is not set
+    """
+    if not GOOGLE_API_KEY:
+        raise ValueError("GOOGLE_API_KEY not found in environment")
+    
+    from langchain_google_genai import ChatGoogleGenerativeAI
+    
+    return ChatGoogleGenerativeAI(
+        model="gemini-2.5-flash-lite",
+        temperature=0.2,
+        google_api_key=GOOGLE_API_KEY
+    )
+
+
+def _text_key(text: str) -> bytes:
+    """Fast 128-bit fingerprint of a text, used as a cache key."""
+    return xxhash.xxh3_128_digest(text.encode("utf-8"))
+
+
+def _index_for(resume_key: bytes, resume_text: str):
+    """
+    Return the in-memory FAISS store for a resume, building it on first use.
+    
+    Args:
+        resume_key: _text_key(resume_text)
+        resume_text: Raw resume text
+    
+    Returns:
+        FAISS vectorstore over the resume's chunks
+    """
+    vectordb = _index_cache.get(resume_key)
+    if vectordb is None:
+        from .chunker import make_chunks
+        from .vector_store import build_vector_store
+        
+        vectordb = build_vector_store(make_chunks([resume_text]), persist_directory=None)
+        _index_cache.put(resume_key, vectordb)
+    return vectordb
+
+
+def _fits_in_context(text: str) -> bool:
+    """True if the text is short enough to skip retrieval (~4 chars per token)."""
+    return len(text) // CHARS_PER_TOKEN < RETRIEVAL_TOKEN_THRESHOLD
+
+
+# ==================== PROMPT TEMPLATES ====================
+# Each prompt is a constant system message (instructions and scoring rubric,
+# built once at import) plus a human message holding only the per-request
+# values, assembled by plain concatenation instead of a large f-string.
+#
+# Ordering matters: the invariant instructions come FIRST and the per-request
+# text LAST (resume, then job description). Gemini reuses cached prefill for
+# identical prompt prefixes, so a stable prefix (plus the same resume scored
+# against several JDs) is only processed once.
+
+Prompt = List[BaseMessage]
+
+_SKILLS_SYSTEM_MESSAGE = SystemMessage(content="""
+You are a resume skill extractor. Analyze the resume content and extract ONLY the explicitly mentioned skills.
+
+Rules:
+- Extract ONLY skills that are explicitly mentioned in the resume
+- DO NOT infer or guess skills
+- Return clean, standardized skill names (e.g., "Python", "Project Management")
+- Remove duplicates
+- If no skills are found, return empty array
+""".strip())
+
+_ATS_SYSTEM_MESSAGE = SystemMessage(content="""
+You are an ATS (Applicant Tracking System) evaluator.
+
+Analyze the resume content against the job description.
+
+Scoring Rules:
+- Skills match: 40%
+- Experience relevance: 30%
+- Tools & keywords: 20%
+- Resume clarity & impact: 10%
+
+Rules:
+- Total ats_score must be out of 100
+- Do NOT use external knowledge
+- If data is missing, mark it clearly
+""".strip())
+
+_RESUME_HEADER = "Resume Content:\n"
+
+_ATS_SKILLS_HEAD = "\n\nExtracted Skills:\n"
+
+# Sent (after the bad reply) when a response could not be parsed as JSON
+_JSON_RETRY_MESSAGE = HumanMessage(
+    content="Your previous response was not valid JSON. "
+            "Return ONLY the JSON object, no prose, no code fences."
+)
+
+_ATS_PROMPT_MID = """
+
+Job Description:
+"""
+
+
+# Output formats, enforced by Gemini's structured output (response_schema),
+# so the prompts above do not need to spell out the JSON layout
+_SKILLS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "skills": {"type": "array", "items": {"type": "string"}},
+    },
+    "required": ["skills"],
+}
+
+_ATS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "ats_score": {"type": "integer"},
+        "skills_match_score": {"type": "integer"},
+        "experience_relevance_score": {"type": "integer"},
+        "tools_keywords_score": {"type": "integer"},
+        "resume_clarity_score": {"type": "integer"},
+        "missing_skills": {"type": "array", "items": {"type": "string"}},
+        "weak_areas": {"type": "array", "items": {"type": "string"}},
+        "suggestions": {"type": "array", "items": {"type": "string"}},
+    },
+    "required": [
+        "ats_score", "skills_match_score", "experience_relevance_score",
+        "tools_keywords_score", "resume_clarity_score",
+        "missing_skills", "weak_areas", "suggestions",
+    ],
+}
+
+# Markdown code fence around a JSON reply: ```json\n{...}\n```
+# Only a fallback: structured output returns bare JSON
+_FENCE = "```"
 
 
 # ==================== BACKEND API FUNCTIONS ====================
@@ -14,7 +200,8 @@ def extract_skills_only(resume_text: str) -> Dict[str, Any]:
     Extract skills from resume text only.
     
     Performs skill extraction on raw resume text without requiring job description.
-    Uses in-memory FAISS vector store for optimal chunking and retrieval.
+    Resumes that fit in the prompt are sent whole; longer ones are chunked
+    into an in-memory FAISS vector store and only the top chunks are used.
     
     Args:
         resume_text: Raw resume text (string, can be multi-line)
@@ -30,38 +217,43 @@ def extract_skills_only(resume_text: str) -> Dict[str, Any]:
         result = extract_skills_only(resume_text)
         skills = result["extracted_skills"]  # ["Python", "AWS", ...]
     """
-    from .chunker import make_chunks
-    from .vector_store import build_vector_store
-    
     # Validate input
     if not resume_text or not resume_text.strip():
         raise ValueError("Resume text cannot be empty")
     
-    api_key = os.getenv("GOOGLE_API_KEY")
-    if not api_key:
+    if not GOOGLE_API_KEY:
         raise ValueError("GOOGLE_API_KEY not found in environment")
     
-    # STEP 1: Chunk the resume text
-    chunks = make_chunks([resume_text])
-    
-    # STEP 2: Build in-memory FAISS vector store (no disk persistence)
-    vectordb = build_vector_store(chunks, persist_directory=None)
-    
-    # STEP 3: Retrieve relevant chunks
-    retriever = vectordb.as_retriever(search_kwargs={"k": 10})
-    docs = retriever.invoke("skills experience")
-    context = "\n\n".join([d.page_content for d in docs])
+    # STEP 0: Exact cache lookup on the resume hash (skills do not depend on a JD)
+    resume_key = _text_key(resume_text)
+    cached = _skills_cache.get(resume_key)
+    if cached is not None:
+        return {"extracted_skills": list(cached)}
+    
+    if _fits_in_context(resume_text):
+        # STEPS 1-3 skipped: a typical resume fits in the prompt as-is
+        context = resume_text
+    else:
+        from .vector_store import get_embedding_model
+        
+        # STEPS 1-2: Chunk the resume into an in-memory FAISS store (reused per resume)
+        vectordb = _index_for(resume_key, resume_text)
+        
+        # STEP 3: Retrieve relevant chunks (query embedding is cached)
+        query_vector = get_embedding_model().embed_query("skills experience")
+        docs = vectordb.similarity_search_by_vector(query_vector, k=10)
+        context = "\n\n".join([d.page_content for d in docs])
     
-    # STEP 4: Initialize LLM
-    llm = ChatGoogleGenerativeAI(
-        model="gemini-2.5-flash-lite",
-        temperature=0.2,
-        google_api_key=api_key
-    )
+    # STEP 4: Get the shared LLM client
+    llm = _get_llm()
     
     # STEP 5: Extract skills using existing helper
     extracted_skills = _extract_skills_from_resume(llm, context)
     
+    # Stored as a tuple so callers cannot mutate the cached entry
+    if extracted_skills:
+        _skills_cache.put(resume_key, tuple(extracted_skills))
+    
     return {"extracted_skills": extracted_skills}
 
 
@@ -70,7 +262,8 @@ def evaluate_ats_only(resume_text: str, job_description: str) -> Dict[str, Any]:
     Evaluate ATS score of resume against job description.
     
     Performs ATS evaluation on raw resume text and job description.
-    Uses in-memory FAISS vector store for optimal chunking and retrieval.
+    Resumes that fit in the prompt are sent whole; longer ones are chunked
+    into an in-memory FAISS vector store and only the top chunks are used.
     
     Args:
         resume_text: Raw resume text (string, can be multi-line)
@@ -94,43 +287,232 @@ def evaluate_ats_only(resume_text: str, job_description: str) -> Dict[str, Any]:
         result = evaluate_ats_only(resume_text, job_description)
         score = result["ats_score"]  # 75
     """
-    from .chunker import make_chunks
-    from .vector_store import build_vector_store
-    
     # Validate inputs
     if not resume_text or not resume_text.strip():
         raise ValueError("Resume text cannot be empty")
     if not job_description or not job_description.strip():
         raise ValueError("Job description cannot be empty")
     
-    api_key = os.getenv("GOOGLE_API_KEY")
-    if not api_key:
+    if not GOOGLE_API_KEY:
         raise ValueError("GOOGLE_API_KEY not found in environment")
     
-    # STEP 1: Chunk the resume text
-    chunks = make_chunks([resume_text])
-    
-    # STEP 2: Build in-memory FAISS vector store (no disk persistence)
-    vectordb = build_vector_store(chunks, persist_directory=None)
+    from .vector_store import get_embedding_model
+    
+    # STEP 0: Semantic cache lookup (skips retrieval + LLM on a hit)
+    # Same resume (exact hash) + similar JD (embedding); the JD vector is
+    # also the retrieval query below, so the lookup costs no extra API call
+    resume_key = _text_key(resume_text)
+    query_vector = get_embedding_model().embed_query(job_description)
+    cached = _ats_cache.get(query_vector, namespace=resume_key)
+    if cached is not None:
+        return cached
+    
+    if _fits_in_context(resume_text):
+        # STEPS 1-3 skipped: a typical resume fits in the prompt as-is
+        context = resume_text
+    else:
+        # STEPS 1-2: Chunk the resume into an in-memory FAISS store (reused per resume)
+        vectordb = _index_for(resume_key, resume_text)
+        
+        # STEP 3: Retrieve relevant chunks based on job description
+        docs = vectordb.similarity_search_by_vector(query_vector, k=5)
+        context = "\n\n".join([d.page_content for d in docs])
     
-    # STEP 3: Retrieve relevant chunks based on job description
-    retriever = vectordb.as_retriever(search_kwargs={"k": 5})
-    docs = retriever.invoke(job_description)
-    context = "\n\n".join([d.page_content for d in docs])
-    
-    # STEP 4: Initialize LLM
-    llm = ChatGoogleGenerativeAI(
-        model="gemini-2.5-flash-lite",
-        temperature=0.2,
-        google_api_key=api_key
-    )
+    # STEP 4: Get the shared LLM client
+    llm = _get_llm()
     
     # STEP 5: Evaluate ATS using existing helper (no skill extraction)
     ats_result = _evaluate_ats(llm, context, job_description, extracted_skills=[])
     
+    # Never cache a failed (unparseable) LLM response
+    if "error" not in ats_result:
+        _ats_cache.put(query_vector, ats_result, namespace=resume_key)
+    
     return ats_result
 
 
+def analyze_resume(resume_text: str, job_description: str) -> Dict[str, Any]:
+    """
+    Extract skills AND evaluate ATS score for one resume in one pipeline run.
+    
+    Equivalent to extract_skills_only + evaluate_ats_only, but the resume is
+    looked up / indexed once: both retrievals ("skills experience", k=10 and
+    the JD, k=5) run against the same FAISS store, then the two LLM calls
+    run concurrently. Results are shared with the caches of the two
+    single-purpose functions.
+    
+    Args:
+        resume_text: Raw resume text (string, can be multi-line)
+        job_description: Job description to compare against
+    
+    Returns:
+        Dictionary with:
+        - "extracted_skills": List of skill strings
+        - "ats_result": ATS scores and recommendations (see evaluate_ats_only)
+    
+    Raises:
+        ValueError: If inputs are empty or API key not set
+    
+    Example:
+        result = analyze_resume(resume_text, job_description)
+        skills, score = result["extracted_skills"], result["ats_result"]["ats_score"]
+    """
+    # Validate inputs
+    if not resume_text or not resume_text.strip():
+        raise ValueError("Resume text cannot be empty")
+    if not job_description or not job_description.strip():
+        raise ValueError("Job description cannot be empty")
+    
+    if not GOOGLE_API_KEY:
+        raise ValueError("GOOGLE_API_KEY not found in environment")
+    
+    from .vector_store import get_embedding_model
+    
+    # STEP 0: Cache lookups (skills by resume hash, ATS by resume + similar JD)
+    embeddings = get_embedding_model()
+    resume_key = _text_key(resume_text)
+    query_vector = embeddings.embed_query(job_description)
+    cached_skills = _skills_cache.get(resume_key)
+    ats_result = _ats_cache.get(query_vector, namespace=resume_key)
+    if cached_skills is not None and ats_result is not None:
+        return {"extracted_skills": list(cached_skills), "ats_result": ats_result}
+    
+    if _fits_in_context(resume_text):
+        # STEPS 1-3 skipped: a typical resume fits in the prompt as-is
+        skills_context = ats_context = resume_text
+    else:
+        # STEPS 1-2: ONE in-memory FAISS store for both retrievals
+        vectordb = _index_for(resume_key, resume_text)
+        
+        # STEP 3: Retrieve only the contexts still needed
+        if cached_skills is None:
+            docs = vectordb.similarity_search_by_vector(embeddings.embed_query("skills experience"), k=10)
+            skills_context = "\n\n".join([d.page_content for d in docs])
+        if ats_result is None:
+            docs = vectordb.similarity_search_by_vector(query_vector, k=5)
+            ats_context = "\n\n".join([d.page_content for d in docs])
+    
+    # STEP 4: Get the shared LLM client
+    llm = _get_llm()
+    
+    # STEP 5: Missing results in parallel (skills in the pool, ATS here)
+    skills_future = None
+    if cached_skills is None:
+        skills_future = _llm_pool.submit(_extract_skills_from_resume, llm, skills_context)
+    if ats_result is None:
+        ats_result = _evaluate_ats(llm, ats_context, job_description, extracted_skills=[])
+        if "error" not in ats_result:
+            _ats_cache.put(query_vector, ats_result, namespace=resume_key)
+    
+    if skills_future is None:
+        extracted_skills = list(cached_skills)
+    else:
+        extracted_skills = skills_future.result()
+        if extracted_skills:
+            _skills_cache.put(resume_key, tuple(extracted_skills))
+    
+    return {"extracted_skills": extracted_skills, "ats_result": ats_result}
+
+
+def analyze_resumes_batch(resumes: List[str], job_description: str) -> List[Dict[str, Any]]:
+    """
+    Extract skills and evaluate ATS for many resumes against one job description.
+    
+    Amortizes the per-resume setup of the single-resume functions:
+    - resumes short enough for the prompt are used whole (no retrieval)
+    - ONE FAISS index holds the chunks of every longer resume (tagged with resume_id)
+    - the JD is embedded once and searched once; hits are grouped per resume
+    - skill-extraction and ATS prompts go out as concurrent llm.batch() calls
+      (one per prompt-length bin) instead of 2N sequential round-trips
+    
+    Args:
+        resumes: Raw resume texts
+        job_description: Job description to compare every resume against
+    
+    Returns:
+        One dict per resume, in input order, with:
+        - "extracted_skills": List of skill strings
+        - "ats_result": ATS scores and recommendations (see evaluate_ats_only)
+    
+    Raises:
+        ValueError: If any input is empty or API key not set
+    
+    Example:
+        results = analyze_resumes_batch([resume_a, resume_b], job_description)
+        scores = [r["ats_result"]["ats_score"] for r in results]
+    """
+    # Validate inputs
+    if not resumes:
+        raise ValueError("At least one resume is required")
+    for i, resume_text in enumerate(resumes):
+        if not resume_text or not resume_text.strip():
+            raise ValueError(f"Resume text #{i + 1} cannot be empty")
+    if not job_description or not job_description.strip():
+        raise ValueError("Job description cannot be empty")
+    
+    if not GOOGLE_API_KEY:
+        raise ValueError("GOOGLE_API_KEY not found in environment")
+    
+    # Short resumes are used whole; only the long ones go through retrieval
+    contexts_text: List[str] = [
+        resume_text if _fits_in_context(resume_text) else ""
+        for resume_text in resumes
+    ]
+    long_ids = [i for i, context in enumerate(contexts_text) if not context]
+    
+    if long_ids:
+        from .chunker import make_chunks
+        from .vector_store import build_vector_store, get_embedding_model
+        
+        # STEP 1: Chunk every long resume, tagging chunks with their resume index
+        chunks = []
+        for resume_id in long_ids:
+            for chunk in make_chunks([resumes[resume_id]]):
+                chunk.metadata = {**chunk.metadata, "resume_id": resume_id}
+                chunks.append(chunk)
+        
+        # STEP 2: Build ONE in-memory FAISS vector store for all of them
+        # exact=True: the ranked search below must reach every chunk, which the
+        # approximate IVF/HNSW tiers do not guarantee (CPU: GPU search caps k at 2048)
+        vectordb = build_vector_store(chunks, persist_directory=None, use_gpu=False, exact=True)
+        
+        # STEP 3: Single ranked search over all chunks, then top-5 per resume
+        query_vector = get_embedding_model().embed_query(job_description)
+        ranked = vectordb.similarity_search_by_vector(query_vector, k=len(chunks))
+        contexts: Dict[int, List[str]] = {i: [] for i in long_ids}
+        for doc in ranked:
+            hits = contexts[doc.metadata["resume_id"]]
+            if len(hits) < 5:
+                hits.append(doc.page_content)
+        for resume_id, hits in contexts.items():
+            # Never send an empty context: fall back to the start of the resume
+            contexts_text[resume_id] = (
+                "\n\n".join(hits) if hits
+                else resumes[resume_id][:RETRIEVAL_TOKEN_THRESHOLD * CHARS_PER_TOKEN]
+            )
+    
+    # STEP 4: Every skills and ATS bin runs concurrently (each has its own output schema)
+    llm = _get_llm()
+    skills_batches = _submit_binned(
+        _with_schema(llm, _SKILLS_SCHEMA),
+        [_build_skills_prompt(context) for context in contexts_text]
+    )
+    ats_batches = _submit_binned(
+        _with_schema(llm, _ATS_SCHEMA),
+        [_build_ats_prompt(context, job_description, []) for context in contexts_text]
+    )
+    skills_responses = _collect_binned(skills_batches, len(contexts_text))
+    ats_responses = _collect_binned(ats_batches, len(contexts_text))
+    
+    return [
+        {
+            "extracted_skills": _parse_skills_response(skills.content),
+            "ats_result": _parse_ats_response(ats.content)
+        }
+        for skills, ats in zip(skills_responses, ats_responses)
+    ]
+
+
 # ==================== HELPER FUNCTIONS ====================
 
 def _extract_skills_from_resume(llm: ChatGoogleGenerativeAI, resume_content: str) -> list:
@@ -144,38 +526,138 @@ def _extract_skills_from_resume(llm: ChatGoogleGenerativeAI, resume_content: str
     Returns:
         List of skill strings
     """
-    skill_extraction_prompt = f"""
-You are a resume skill extractor. Analyze the resume content and extract ONLY the explicitly mentioned skills.
+    parsed_skills, _ = _request_json(_with_schema(llm, _SKILLS_SCHEMA), _build_skills_prompt(resume_content))
+    if parsed_skills is None:
+        return []
+    return parsed_skills.get("skills", [])
 
-Resume Content:
-{resume_content}
 
-STRICT OUTPUT FORMAT (JSON ONLY — no markdown, no explanation):
+def _with_schema(llm: ChatGoogleGenerativeAI, schema: Dict[str, Any]):
+    """
+    Bind Gemini structured output to the LLM.
+    
+    With response_mime_type="application/json" and a response_schema, Gemini
+    returns bare JSON that matches the schema (no markdown fences, integer
+    scores), so the prompts no longer need a format section.
+    """
+    return llm.bind(response_mime_type="application/json", response_schema=schema)
 
-{{
-  "skills": [string]
-}}
 
-Rules:
-- Extract ONLY skills that are explicitly mentioned in the resume
-- DO NOT infer or guess skills
-- Return clean, standardized skill names (e.g., "Python", "Project Management")
-- Remove duplicates
-- If no skills are found, return empty array
-"""
-    response = llm.invoke(skill_extraction_prompt)
-    raw_response = response.content.strip()
+def _request_json(llm: ChatGoogleGenerativeAI, prompt: Prompt) -> Tuple[Optional[Any], str]:
+    """
+    Get a JSON reply from the LLM, with one self-correction retry.
+    
+    If the first reply does not parse, it is sent back to the model
+    together with _JSON_RETRY_MESSAGE and the model is asked once more,
+    so a rare formatting slip does not waste the retrieval work before it.
+    
+    Args:
+        llm: ChatGoogleGenerativeAI instance (usually with a JSON schema bound)
+        prompt: System + human messages
     
-    # Clean markdown code blocks if present
-    if raw_response.startswith("```"):
-        raw_response = raw_response.split("```")[1]
-        if raw_response.startswith("json\n"):
-            raw_response = raw_response[5:]
+    Returns:
+        Tuple of (parsed JSON or None if both attempts failed, last raw reply)
+    """
+    raw_response = _stream_json_reply(llm, prompt)
+    try:
+        return _load_llm_json(raw_response), raw_response
+    except orjson.JSONDecodeError:
+        pass
     
+    retry_prompt = prompt + [AIMessage(content=raw_response), _JSON_RETRY_MESSAGE]
+    raw_response = _stream_json_reply(llm, retry_prompt)
     try:
-        parsed_skills = json.loads(raw_response)
+        return _load_llm_json(raw_response), raw_response
+    except orjson.JSONDecodeError:
+        return None, raw_response
+
+
+def _stream_json_reply(llm: ChatGoogleGenerativeAI, prompt: Prompt) -> str:
+    """
+    Stream an LLM reply that is expected to be JSON and return the full text.
+    
+    Tokens are collected as they arrive. As soon as the first non-whitespace
+    character is known, an off-format reply (anything other than a JSON
+    object or a code fence) stops the stream early instead of paying for the
+    rest of the generation; the parser then takes its normal error path.
+    
+    Args:
+        llm: ChatGoogleGenerativeAI instance
+        prompt: System + human messages
+    
+    Returns:
+        Raw reply text (possibly truncated if it went off-format)
+    """
+    parts: List[str] = []
+    checked = False
+    for chunk in llm.stream(prompt):
+        parts.append(chunk.content)
+        if not checked:
+            head = "".join(parts).lstrip()
+            if head:
+                checked = True
+                if head[0] not in "{`":
+                    break
+    return "".join(parts)
+
+
+def _build_skills_prompt(resume_content: str) -> Prompt:
+    """Assemble the skill-extraction messages for one resume."""
+    return [_SKILLS_SYSTEM_MESSAGE, HumanMessage(content=_RESUME_HEADER + resume_content)]
+
+
+def _load_llm_json(raw_response: str) -> Any:
+    """
+    Parse JSON from an LLM reply.
+    
+    Parsed with orjson (Rust parser, accepts str directly). Most replies
+    are already bare JSON, so they are parsed as-is first; only
+    if that fails is a markdown code fence stripped with _clean_json.
+    
+    Raises:
+        orjson.JSONDecodeError: If the reply is not JSON, fenced or not
+    """
+    try:
+        return orjson.loads(raw_response)
+    except orjson.JSONDecodeError:
+        cleaned = _clean_json(raw_response)
+        if cleaned is raw_response:
+            raise
+        return orjson.loads(cleaned)
+
+
+def _clean_json(raw: str) -> str:
+    """
+    Return the body of a ```/```json fenced reply, or `raw` itself if unfenced.
+    
+    One lstrip and two find() calls on the original string: no split into
+    lines and no intermediate copies besides the final slice.
+    """
+    start = len(raw) - len(raw.lstrip())
+    if not raw.startswith(_FENCE, start):
+        return raw
+    
+    # Body starts after the opening fence line (```json\n), or right after
+    # the fence and an optional json tag for a one-line reply (```{...}```)
+    newline = raw.find("\n", start + len(_FENCE))
+    if newline != -1:
+        body_start = newline + 1
+    else:
+        body_start = start + len(_FENCE)
+        if raw.startswith("json", body_start):
+            body_start += len("json")
+    body_end = raw.find(_FENCE, body_start)
+    if body_end == -1:
+        body_end = len(raw)
+    return raw[body_start:body_end]
+
+
+def _parse_skills_response(raw_response: str) -> list:
+    """Parse the skills list out of a raw LLM reply ([] if unparseable)."""
+    try:
+        parsed_skills = _load_llm_json(raw_response)
         return parsed_skills.get("skills", [])
-    except json.JSONDecodeError:
+    except orjson.JSONDecodeError:
         return []
 
 
@@ -192,104 +674,165 @@ def _evaluate_ats(llm: ChatGoogleGenerativeAI, resume_content: str, job_descript
     Returns:
         Dict with ATS scores and recommendations
     """
-    # Include extracted skills in the prompt context
-    skills_context = f"\n\nExtracted Skills:\n{', '.join(extracted_skills)}" if extracted_skills else ""
+    parsed_output, raw_response = _request_json(
+        _with_schema(llm, _ATS_SCHEMA),
+        _build_ats_prompt(resume_content, job_description, extracted_skills)
+    )
+    if parsed_output is None:
+        return _ats_error(raw_response)
+    return parsed_output
+
+
+def _build_ats_prompt(resume_content: str, job_description: str, extracted_skills: list) -> Prompt:
+    """Assemble the ATS messages for one resume / JD pair."""
+    # One join over the constant and variable parts: a single allocation
+    # instead of one intermediate string per "+". The two layouts are
+    # spelled out so the common no-skills case does no skills work at all.
+    if extracted_skills:
+        content = "".join((
+            _RESUME_HEADER, resume_content, "\n",
+            _ATS_SKILLS_HEAD, ", ".join(extracted_skills),
+            _ATS_PROMPT_MID, job_description
+        ))
+    else:
+        content = "".join((
+            _RESUME_HEADER, resume_content, "\n",
+            _ATS_PROMPT_MID, job_description
+        ))
+    
+    return [_ATS_SYSTEM_MESSAGE, HumanMessage(content=content)]
+
+
+def _parse_ats_response(raw_response: str) -> Dict[str, Any]:
+    """Parse the ATS JSON out of a raw LLM reply (error dict if unparseable)."""
+    try:
+        parsed_output = _load_llm_json(raw_response)
+    except orjson.JSONDecodeError:
+        parsed_output = _ats_error(raw_response)
     
-    ats_prompt = f"""
-You are an ATS (Applicant Tracking System) evaluator.
+    return parsed_output
 
-Analyze the resume content against the job description and return ONLY valid JSON.
 
-Resume Content:
-{resume_content}
-{skills_context}
+def _ats_error(raw_response: str) -> Dict[str, Any]:
+    """Error result returned when the ATS reply is not valid JSON."""
+    return {
+        "error": "Invalid JSON response from LLM",
+        "raw_output": raw_response
+    }
 
-Job Description:
-{job_description}
 
-Scoring Rules:
-- Skills match: 40%
-- Experience relevance: 30%
-- Tools & keywords: 20%
-- Resume clarity & impact: 10%
+def _submit_binned(llm: ChatGoogleGenerativeAI, prompts: List[Prompt]) -> List[Tuple[List[int], Future]]:
+    """
+    Start llm.batch() calls for many prompts, grouped by prompt length.
+    
+    Prompts are bucketed by the length of their human message (the system
+    message is the same for every prompt) // BATCH_BIN_WIDTH into at most
+    BATCH_NUM_BINS bins. Each bin is submitted to _llm_pool as its own batch,
+    so bins run concurrently and a bin of short prompts returns as soon as
+    its own requests do (multi-bin batching).
+    
+    Submitting from the caller (never from inside a pool task) keeps every
+    pool task a leaf, so concurrent requests cannot deadlock the pool.
+    
+    Args:
+        llm: ChatGoogleGenerativeAI instance
+        prompts: System + human message lists
+    
+    Returns:
+        (prompt indices, future of their responses) per bin; see _collect_binned
+    """
+    bins: Dict[int, List[int]] = {}
+    for i, prompt in enumerate(prompts):
+        b = min(len(prompt[-1].content) // BATCH_BIN_WIDTH, BATCH_NUM_BINS - 1)
+        bins.setdefault(b, []).append(i)
+    
+    return [
+        (indices, _llm_pool.submit(llm.batch, [prompts[i] for i in indices]))
+        for indices in bins.values()
+    ]
 
-STRICT OUTPUT FORMAT (JSON ONLY — no markdown, no explanation):
 
-{{
-  "ats_score": number,
-  "skills_match_score": number,
-  "experience_relevance_score": number,
-  "tools_keywords_score": number,
-  "resume_clarity_score": number,
-  "missing_skills": [string],
-  "weak_areas": [string],
-  "suggestions": [string]
-}}
+def _collect_binned(batches: List[Tuple[List[int], Future]], n_prompts: int) -> list:
+    """
+    Wait for the bins started by _submit_binned.
+    
+    Returns:
+        LLM responses in the original prompt order
+    """
+    responses = [None] * n_prompts
+    for indices, future in batches:
+        for i, response in zip(indices, future.result()):
+            responses[i] = response
+    return responses
 
-Rules:
-- Scores must be integers
-- Total ats_score must be out of 100
-- Do NOT use external knowledge
-- If data is missing, mark it clearly
-"""
-    response = llm.invoke(ats_prompt)
-    raw_response = response.content.strip()
+
+def _extract_skills_and_evaluate_ats(llm: ChatGoogleGenerativeAI, resume_content: str, job_description: str) -> Tuple[list, Dict[str, Any]]:
+    """
+    Run skill extraction and ATS evaluation concurrently.
     
-    # Clean markdown code blocks if present
-    if raw_response.startswith("```"):
-        raw_response = raw_response.split("```")[1]
-        if raw_response.startswith("json\n"):
-            raw_response = raw_response[5:]
+    The two prompts are independent, so their Gemini round-trips overlap and
+    the wall-clock cost is ~max(T_skills, T_ats) instead of the sum. The ATS
+    prompt therefore does not receive the extracted skills (it scores the
+    resume content directly, as evaluate_ats_only does).
     
-    try:
-        parsed_output = json.loads(raw_response)
-    except json.JSONDecodeError:
-        parsed_output = {
-            "error": "Invalid JSON response from LLM",
-            "raw_output": raw_response
-        }
+    Args:
+        llm: ChatGoogleGenerativeAI instance
+        resume_content: Resume text
+        job_description: Job description
     
-    return parsed_output
+    Returns:
+        Tuple of (extracted skills list, ATS result dict)
+    """
+    skills_future = _llm_pool.submit(_extract_skills_from_resume, llm, resume_content)
+    ats_result = _evaluate_ats(llm, resume_content, job_description, extracted_skills=[])
+    return skills_future.result(), ats_result
 
 
 # ==================== LEGACY CLI SUPPORT ====================
 
+@functools.lru_cache(maxsize=1)
 def build_rag_chain():
     """
     Creates the full RAG pipeline for CLI compatibility.
     Uses pre-built FAISS index from load_retriever().
     
+    Cached: the FAISS index, embeddings client, LLM client and the returned
+    closure are built once per process and reused by every later call.
+    
     Returns:
         Function that takes job_description and returns analysis dict
     """
     from .retriever import load_retriever
+    from .vector_store import get_embedding_model
     
-    retriever = load_retriever()
-    api_key = os.getenv("GOOGLE_API_KEY")
-    if not api_key:
-        raise ValueError("GOOGLE_API_KEY not found in environment")
-    
-    llm = ChatGoogleGenerativeAI(
-        model="gemini-2.5-flash-lite",
-        temperature=0.2,
-        google_api_key=api_key
-    )
+    retrieve = load_retriever()
+    embeddings = get_embedding_model()
+    llm = _get_llm()
 
     def rag_ask(question: str):
         """
         Run the complete RAG flow with skill extraction and ATS evaluation.
         Uses pre-built FAISS index from file.
         """
-        docs = retriever.invoke(question)
+        query_vector = embeddings.embed_query(question)
+        cached = _rag_ask_cache.get(query_vector)
+        if cached is not None:
+            return cached
+        
+        # retrieve() embeds the question again, which is a hit in the query-embedding LRU
+        docs = retrieve(question)
         context = "\n\n".join([d.page_content for d in docs])
         
-        # Use core helper functions
-        extracted_skills = _extract_skills_from_resume(llm, context)
-        ats_result = _evaluate_ats(llm, context, question, extracted_skills)
+        # Use core helper functions (both LLM calls run concurrently)
+        extracted_skills, ats_result = _extract_skills_and_evaluate_ats(llm, context, question)
         
-        return {
+        result = {
             "extracted_skills": extracted_skills,
             "ats_result": ats_result
         }
+        if "error" not in ats_result:
+            _rag_ask_cache.put(query_vector, result)
+        
+        return result
     
     return rag_ask
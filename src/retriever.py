@@ -1,35 +1,66 @@
-from langchain_community.vectorstores import FAISS
-# Importing FAISS vectorstore class from LangChain community package
-# FAISS is an efficient on-disk/in-memory nearest-neighbour search index used for similarity search of embeddings
-from langchain_google_genai import GoogleGenerativeAIEmbeddings
-# Calling a class that lets you call Gemini embeddings via langchain-compatible interface
+import faiss
+# Raw FAISS bindings, used to tune the loaded index for single-query search
+import functools
+# to memoize the loaded retriever
 import os
-from dotenv import load_dotenv
-load_dotenv()
-
-def load_retriever(db_path="data/faiss_index"):
-    # This function will load faiss index from disk and return retriever object you can use
-    # to get nearest chunks for a query.
-    api_key = os.getenv("GOOGLE_API_KEY")
-    if not api_key:
-        # To check whether key is present or not
-        raise ValueError("Google_API_KEY not set in .env")
-    
-    embeddings = GoogleGenerativeAIEmbeddings(
-        model="models/text-embedding-004",
-        google_api_key=api_key
-    )
-
-    vectordb = FAISS.load_local(
-        folder_path=db_path,
-        # loads the previously saved FAISS index from folder_path
-        embeddings=embeddings,
-        # attach your embeddings wrapper so the vectordb can embed queries in the same way like the text
-        allow_dangerous_deserialization=True
-        # Flag that allows loading serialized Python objects saved into the index
-    )
-    retriever = vectordb.as_retriever(search_kwargs={"k": 5})
-    # Converting the FAISS vectorstore into a retriever object
-    # k=5 makes sure that the top 5 closest chunks be returned for any query
-
-    return retriever
\ No newline at end of file
+from typing import Callable, List
+# to use type hints
+import numpy as np
+# for the warm-up query vector
+
+try:
+    from .vector_store import FAISS_DIR, HNSW_EF_SEARCH, IVF_NPROBE, base_index, index_to_gpu, load_vector_store
+except ImportError:
+    # this file is also imported as a top-level module (python src/main.py)
+    from vector_store import FAISS_DIR, HNSW_EF_SEARCH, IVF_NPROBE, base_index, index_to_gpu, load_vector_store
+# load_vector_store memory-maps the saved index and rebuilds the LangChain FAISS wrapper around it
+
+RETRIEVER_K = 5
+# Number of closest chunks returned for every query
+
+@functools.lru_cache(maxsize=1)
+def load_retriever(db_path=FAISS_DIR) -> Callable[[str], List]:
+    # This function will load faiss index from disk and return a retrieve(query) function you can use
+    # to get nearest chunks (LangChain Documents) for a query.
+    # Cached per db_path: the embeddings client and the mmap'd index are set up once per process
+    # and every later call (from any thread) gets the same retriever
+
+    vectordb = load_vector_store(db_path)
+    # Raises ValueError if GOOGLE_API_KEY is not set (needed to embed the queries)
+
+    ivf = faiss.try_extract_index_ivf(vectordb.index)
+    if ivf is not None:
+        # Large indexes are IVF / IVF-PQ: scan the IVF_NPROBE closest clusters per query
+        ivf.nprobe = min(IVF_NPROBE, ivf.nlist)
+        faiss.omp_set_num_threads(os.cpu_count() or 1)
+        ivf.parallel_mode = 1
+        # The retriever sends one query at a time, and FAISS parallelises over queries by default
+        # parallel_mode=1 splits the inverted lists of a single query across all cores instead
+
+    hnsw = base_index(vectordb.index)
+    # The index sits behind ID-map / PCA wrappers, tune the index underneath
+    if isinstance(hnsw, faiss.IndexHNSW):
+        # Very large indexes are HNSW graphs: efSearch trades recall for latency on each k=5 query
+        hnsw.hnsw.efSearch = HNSW_EF_SEARCH
+
+    if os.getenv("USE_GPU_FAISS") == "1":
+        # Opt-in: copy the (already tuned) index to GPU 0 for searching
+        # Stays on CPU without a GPU, on faiss-cpu, or for index types with no GPU version
+        vectordb.index = index_to_gpu(vectordb.index)
+
+    if vectordb.index.ntotal > 0:
+        vectordb.index.search(np.zeros((1, vectordb.index.d), dtype=np.float32), 1)
+        # Warm-up: one dummy search pages in the mmap'd index and starts the OpenMP threads now,
+        # so the first real user query does not pay for it
+
+    embeddings = vectordb.embeddings
+    # Shared embeddings client, repeated queries are answered from its in-memory LRU
+
+    def retrieve(query: str) -> List:
+        # Embeds the query and returns the RETRIEVER_K closest chunks
+        # Calls the vector search directly instead of going through as_retriever(): no Runnable
+        # wrapper, callbacks or config handling on this hot path
+        query_vector = embeddings.embed_query(query)
+        return vectordb.similarity_search_by_vector(query_vector, k=RETRIEVER_K)
+
+    return retrieve
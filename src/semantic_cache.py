@@ -0,0 +1,177 @@
+"""
+semantic_cache.py
+-----------------
+Caches used to skip repeated work on the request path.
+
+1. SemanticCache: approximate (semantic) response cache for the LLM calls.
+2. LRUCache: small exact-key LRU map (e.g. text hash -> embedding vector).
+
+SemanticCache: instead of matching requests by exact text, every response is stored
+next to the embedding of the request that produced it. A new request is
+embedded once, compared against all cached keys with a single matrix-vector
+product, and if the closest key is similar enough the cached response is
+returned — no retrieval and no Gemini call.
+
+Keys are L2-normalised on insert, so the dot product IS the cosine similarity.
+"""
+
+import copy
+import threading
+from collections import OrderedDict, deque
+from typing import Any, Hashable, Optional, Sequence
+
+import numpy as np
+
+
+# ------------------ CONFIGURATION ------------------
+
+# Maximum number of cached responses (least recently used are evicted)
+DEFAULT_CAPACITY = 256
+
+# Minimum cosine similarity for a cached key to count as a hit
+DEFAULT_THRESHOLD = 0.95
+
+
+# ------------------ SEMANTIC CACHE ------------------
+
+class SemanticCache:
+    """
+    Fixed-capacity key/value cache with cosine-similarity lookup.
+
+    Storage is parallel structures in the same slot order:
+    - self._keys: (capacity, D) float32 matrix of normalised embeddings
+    - self._values: list of cached responses
+    - self._namespaces: exact-match tag per entry (e.g. a resume hash);
+      a lookup only considers entries with the same namespace
+
+    A deque keeps slot indices in LRU order (left = oldest). When the cache is
+    full, the oldest slot is overwritten in place.
+
+    All public methods are guarded by a lock so the cache can be shared by
+    the FastAPI worker threads.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, threshold: float = DEFAULT_THRESHOLD):
+        if capacity <= 0:
+            raise ValueError("capacity must be a positive integer")
+
+        self.capacity = capacity
+        self.threshold = threshold
+
+        self._keys: Optional[np.ndarray] = None  # allocated on first insert (D unknown until then)
+        self._values: list = [None] * capacity
+        self._namespaces = np.empty(capacity, dtype=object)
+        self._size = 0
+        self._lru: deque = deque()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._size
+
+    @staticmethod
+    def _normalise(vector: Sequence[float]) -> np.ndarray:
+        q = np.asarray(vector, dtype=np.float32).ravel()
+        norm = np.linalg.norm(q)
+        return q / norm if norm > 0 else q
+
+    def get(self, vector: Sequence[float], namespace: Hashable = None) -> Optional[Any]:
+        """
+        Return a copy of the cached response whose key is most similar to
+        `vector` within `namespace`, or None if nothing is at least
+        `threshold` similar.
+        """
+        q = self._normalise(vector)
+
+        with self._lock:
+            if self._size == 0 or self._keys.shape[1] != q.shape[0]:
+                return None
+
+            sims = self._keys[:self._size] @ q  # single GEMV over all keys
+            sims[self._namespaces[:self._size] != namespace] = -np.inf
+            slot = int(np.argmax(sims))
+            if sims[slot] < self.threshold:
+                return None
+
+            # Mark as most recently used
+            self._lru.remove(slot)
+            self._lru.append(slot)
+            value = self._values[slot]
+
+        # Callers may mutate the result, never hand out the cached object
+        return copy.deepcopy(value)
+
+    def put(self, vector: Sequence[float], value: Any, namespace: Hashable = None) -> None:
+        """Insert a response, evicting the least recently used one if full."""
+        q = self._normalise(vector)
+
+        with self._lock:
+            if self._keys is None or self._keys.shape[1] != q.shape[0]:
+                # First insert (or embedding model changed) -> (re)allocate
+                self._keys = np.zeros((self.capacity, q.shape[0]), dtype=np.float32)
+                self._values = [None] * self.capacity
+                self._namespaces = np.empty(self.capacity, dtype=object)
+                self._size = 0
+                self._lru.clear()
+
+            if self._size < self.capacity:
+                slot = self._size
+                self._size += 1
+            else:
+                slot = self._lru.popleft()
+
+            self._keys[slot] = q
+            self._values[slot] = copy.deepcopy(value)
+            self._namespaces[slot] = namespace
+            self._lru.append(slot)
+
+    def clear(self) -> None:
+        """Drop every cached entry."""
+        with self._lock:
+            self._values = [None] * self.capacity
+            self._namespaces = np.empty(self.capacity, dtype=object)
+            self._size = 0
+            self._lru.clear()
+
+
+# ------------------ EXACT LRU CACHE ------------------
+
+class LRUCache:
+    """
+    Thread-safe, size-bounded mapping with least-recently-used eviction.
+
+    Backed by an OrderedDict: hits are moved to the end with move_to_end(),
+    and the first item is evicted once maxsize is exceeded.
+    Values are returned as-is, so only store immutable/read-only data.
+    """
+
+    def __init__(self, maxsize: int):
+        if maxsize <= 0:
+            raise ValueError("maxsize must be a positive integer")
+
+        self.maxsize = maxsize
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for `key`, or None on a miss."""
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Insert or refresh `key`, evicting the oldest entry if full."""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every cached entry."""
+        with self._lock:
+            self._data.clear()
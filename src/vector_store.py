@@ -12,20 +12,45 @@ chromadb_rust_bindings DLL → constant import errors.
 So I switched to FAISS, which is stable and works offline.
 """
 
-from typing import List
+from typing import List, Tuple
+import functools
 import os
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import xxhash
 
 from langchain_core.documents import Document
 
 # FAISS = Local vector store (no DLL issues on Windows, reliable)
 from langchain_community.vectorstores import FAISS
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain_community.vectorstores.utils import DistanceStrategy
+
+# Raw FAISS bindings, used to pick the index type ourselves
+import faiss
 
 # Embeddings provider → Using Gemini API (text-embedding-004)
 from langchain_google_genai import GoogleGenerativeAIEmbeddings
 
-# Read environment variables from .env file
-from dotenv import load_dotenv
-load_dotenv()
+# On-disk cache in front of the embeddings API
+# (moved to langchain-classic in LangChain 1.0; older releases ship it in langchain)
+try:
+    from langchain_classic.embeddings import CacheBackedEmbeddings
+    from langchain_classic.storage import LocalFileStore
+except ImportError:
+    from langchain.embeddings import CacheBackedEmbeddings
+    from langchain.storage import LocalFileStore
+
+try:
+    # .env is read once, by the config module
+    from .config import GOOGLE_API_KEY
+    from .semantic_cache import LRUCache
+except ImportError:
+    # this file is also imported as a top-level module (python src/main.py)
+    from config import GOOGLE_API_KEY
+    from semantic_cache import LRUCache
 
 
 # ------------------ CONFIGURATION ------------------
@@ -36,44 +61,149 @@ FAISS_DIR = "data/faiss_index"
 # Gemini embedding model (very good quality)
 EMBEDDING_MODEL = "models/text-embedding-004"
 
+# Chunk vectors already computed are stored here (one file per chunk hash)
+EMBEDDING_CACHE_DIR = "data/emb_cache"
+
+# Query vectors kept in memory (queries/JDs repeat a lot)
+QUERY_CACHE_SIZE = 4096
+
+# Chunks per embedding request (Gemini's batchEmbedContents accepts at most 100)
+EMBED_BATCH_SIZE = 100
+
+# Embedding requests in flight at once (stays under the API rate limit)
+EMBED_CONCURRENCY = 8
+
+# Index type by corpus size (see _index_description):
+# - fewer than FLAT_INDEX_MAX_CHUNKS vectors → brute-force scan over SQ8 codes
+# - fewer than IVF_FLAT_MAX_CHUNKS → IVF with sqrt(N) clusters, SQ8 codes
+# - up to IVF_INDEX_MAX_CHUNKS → IVF-PQ (vectors compressed to PQ_M bytes)
+# - anything larger → HNSW graph over SQ8 codes
+# SQ8 = 8-bit scalar quantization, 1 byte per dimension instead of 4: the
+# scan is memory-bound, so 4x less data to read is close to 4x faster
+# From FLAT_INDEX_MAX_CHUNKS on, vectors are also reduced to PCA_DIM
+# dimensions by a PCA stored inside the index (applied to queries too)
+FLAT_INDEX_MAX_CHUNKS = 1_000
+IVF_FLAT_MAX_CHUNKS = 10_000
+IVF_INDEX_MAX_CHUNKS = 100_000
+
+# Number of IVF clusters scanned per query (recall vs speed)
+IVF_NPROBE = 8
+
+# Product-quantizer sub-vectors (8 bits each): 768 float32 = 3 KB → 32 bytes
+PQ_M = 32
+
+# Output dimension of the PCA pre-transform (768 → 256: 3x less to store and scan)
+PCA_DIM = 256
+
+# Neighbours per node in the HNSW graph
+HNSW_M = 32
+
+# HNSW candidate list size while building (graph quality) and searching
+# (recall vs latency; 32 is plenty for k=5)
+HNSW_EF_CONSTRUCTION = 200
+HNSW_EF_SEARCH = 32
+
+
+# Threads for concurrent embedding requests (network-bound, so threads suffice)
+_embed_pool = ThreadPoolExecutor(max_workers=EMBED_CONCURRENCY, thread_name_prefix="embed")
+
 
 # ------------------ EMBEDDING MODEL LOADER ------------------
 
+# Query vectors keyed by a 128-bit hash of the query text
+_query_cache = LRUCache(maxsize=QUERY_CACHE_SIZE)
+
+
+class QueryCachedEmbeddings(GoogleGenerativeAIEmbeddings):
+    """
+    Gemini embeddings that remember recent query vectors.
+
+    embed_query() is called for every search; a repeated query is answered
+    from an in-process LRU cache instead of a ~100-200 ms API round-trip.
+    Calls with extra options (task_type, ...) are not cached.
+    """
+
+    def embed_query(self, text: str, **kwargs) -> List[float]:
+        if kwargs:
+            return super().embed_query(text, **kwargs)
+
+        key = xxhash.xxh3_128_digest(text.encode("utf-8"))
+        vector = _query_cache.get(key)
+        if vector is None:
+            # Stored as a tuple so no caller can mutate the cached entry
+            vector = tuple(super().embed_query(text))
+            _query_cache.put(key, vector)
+        return list(vector)
+
+
+@functools.lru_cache(maxsize=1)
 def get_embedding_model():
     """
     Create and return the embedding model.
     This model converts text chunks → numerical vectors.
 
+    The client is created once per process and shared by every caller
+    (build_vector_store, load_vector_store and so load_retriever).
+
+    Query embeddings go through an in-memory LRU (QueryCachedEmbeddings).
+    Document embeddings of persisted stores are also cached on disk (see
+    _disk_cached_embedding_model); in-memory stores built per request are
+    not, so uploaded resumes never pile up in EMBEDDING_CACHE_DIR.
+
     NOTE:
     - Requires GOOGLE_API_KEY in .env
     - No GPU or PyTorch required (Gemini API runs in cloud)
     """
 
-    api_key = os.getenv("GOOGLE_API_KEY")
-    if not api_key:
+    if not GOOGLE_API_KEY:
         raise ValueError("GOOGLE_API_KEY not found. Add it to your .env file.")
 
-    return GoogleGenerativeAIEmbeddings(
+    return QueryCachedEmbeddings(
         model=EMBEDDING_MODEL,
-        google_api_key=api_key
+        google_api_key=GOOGLE_API_KEY
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def _disk_cached_embedding_model():
+    """
+    get_embedding_model() behind an on-disk cache of document vectors.
+
+    Keyed by a hash of the chunk text (namespaced by model), so rebuilding
+    or updating a persisted index only sends new chunks to the API.
+    Only used for persisted stores (build_index.py, update_vector_store).
+    """
+    return CacheBackedEmbeddings.from_bytes_store(
+        get_embedding_model(),
+        LocalFileStore(EMBEDDING_CACHE_DIR),
+        namespace=EMBEDDING_MODEL,
+        key_encoder="blake2b"
     )
 
 
 # ------------------ BUILD FAISS VECTOR STORE ------------------
 
-def build_vector_store(chunks: List[Document], persist_directory: str = FAISS_DIR):
+def build_vector_store(chunks: List[Document], persist_directory: str = FAISS_DIR, use_gpu: bool = True,
+                       exact: bool = False):
     """
     Takes the list of Document chunks and builds a FAISS vector store.
 
     Steps:
-    1. Convert text chunks → embeddings using Gemini.
-    2. Store them inside FAISS (in-memory database).
+    1. Convert text chunks → embeddings using Gemini (cached on disk when persisting).
+    2. Store them inside FAISS (in-memory database), under stable chunk
+       IDs (chunk_id) so they can later be replaced one by one.
     3. Optionally save the FAISS index to disk (if persist_directory is provided).
+    4. Optionally move the index to the GPU for searching (if one is available).
 
     Args:
         chunks: List of Document chunks to embed and store
         persist_directory: Directory to save FAISS index. If None, keeps index in-memory only.
                           Defaults to FAISS_DIR for backward compatibility.
+        use_gpu: Search on GPU 0 when faiss-gpu and a GPU are available.
+                 Ignored (CPU search) otherwise.
+        exact: Always use the brute-force SQ8 scan, whatever the corpus size.
+               Approximate tiers (IVF, HNSW) may return fewer than k hits,
+               so callers that rank every chunk need this.
 
     Returns:
         FAISS vectorstore (in-memory or persisted, depending on persist_directory)
@@ -82,8 +212,34 @@ def build_vector_store(chunks: List[Document], persist_directory: str = FAISS_DI
     print("Creating embedding model...")
     embeddings = get_embedding_model()
 
+    ids, chunks = _unique_chunks(chunks)
+
     print("Building FAISS index (this may take time on first run)...")
-    vectordb = FAISS.from_documents(chunks, embeddings)
+    # Only persisted stores go through the on-disk vector cache
+    document_embeddings = embeddings if persist_directory is None else _disk_cached_embedding_model()
+    vectors = _embed_chunks(document_embeddings, chunks)
+
+    # IndexIDMap2 stores our stable chunk IDs next to the vectors, so
+    # update_vector_store can later remove / add single chunks by ID
+    index = faiss.IndexIDMap2(_build_faiss_index(vectors, exact=exact))
+
+    # ONE add for the whole contiguous matrix: FAISS releases the GIL and
+    # parallelises internally (the LangChain add path re-copies the vectors)
+    index.add_with_ids(vectors, ids)
+
+    # Wrap the pre-built index so callers keep LangChain's search / save API
+    # add_documents / add_texts are NOT supported on this store (IndexIDMap2
+    # only accepts explicit IDs): use update_vector_store to change chunks
+    # Search results are chunk IDs, so the mapping is chunk ID → docstore ID
+    # No normalize_L2: stored vectors are already unit-length (_embed_chunks) and
+    # the inner-product ranking of a query does not depend on the query's norm
+    vectordb = FAISS(
+        embedding_function=embeddings,
+        index=index,
+        docstore=InMemoryDocstore(_docstore_entries(ids, chunks)),
+        index_to_docstore_id={int(chunk_id): str(chunk_id) for chunk_id in ids},
+        distance_strategy=DistanceStrategy.MAX_INNER_PRODUCT
+    )
 
     # Only persist to disk if persist_directory is provided and not None
     if persist_directory is not None:
@@ -93,9 +249,164 @@ def build_vector_store(chunks: List[Document], persist_directory: str = FAISS_DI
         # Save FAISS DB to disk
         vectordb.save_local(persist_directory)
 
+    # Saved first: write_index only accepts CPU indexes
+    if use_gpu:
+        vectordb.index = index_to_gpu(index)
+
     return vectordb
 
 
+def _unique_chunks(chunks: List[Document]) -> Tuple[np.ndarray, List[Document]]:
+    """Chunk IDs (int64 array) and chunks, with exact duplicates dropped."""
+    unique = {}
+    for chunk in chunks:
+        unique.setdefault(chunk_id(chunk), chunk)
+    return np.fromiter(unique.keys(), dtype=np.int64, count=len(unique)), list(unique.values())
+
+
+def _embed_chunks(embeddings, chunks: List[Document]) -> np.ndarray:
+    """(N, d) float32 unit-length embeddings of the chunks."""
+    vectors = _embed_texts(embeddings, [chunk.page_content for chunk in chunks])
+    # Unit-length vectors: inner product == cosine similarity (what Gemini embeddings are trained for)
+    faiss.normalize_L2(vectors)
+    return vectors
+
+
+def _docstore_entries(ids: np.ndarray, chunks: List[Document]) -> dict:
+    """Docstore entries {docstore ID: Document} for chunks with the given IDs."""
+    return {
+        str(chunk_id): Document(id=str(chunk_id), page_content=chunk.page_content, metadata=chunk.metadata)
+        for chunk_id, chunk in zip(ids, chunks)
+    }
+
+
+def index_to_gpu(index: faiss.Index) -> faiss.Index:
+    """
+    Copy an index to GPU 0 if possible, otherwise return it unchanged.
+
+    Only flat and IVF indexes have GPU implementations (no plain SQ or
+    HNSW), and nothing happens on faiss-cpu builds or machines without
+    a GPU.
+    """
+    gpu_capable = faiss.try_extract_index_ivf(index) is not None or isinstance(index, faiss.IndexFlat)
+    if gpu_capable and _gpu_available():
+        return faiss.index_cpu_to_gpu(_gpu_resources(), 0, index)
+    return index
+
+
+def _gpu_available() -> bool:
+    """True if this FAISS build has GPU support and sees at least one GPU."""
+    return hasattr(faiss, "StandardGpuResources") and faiss.get_num_gpus() > 0
+
+
+@functools.lru_cache(maxsize=1)
+def _gpu_resources():
+    """
+    Return the process-wide faiss.StandardGpuResources.
+
+    It owns the GPU scratch memory and CUDA streams, so one instance is
+    shared by every GPU index instead of allocating them per index.
+    """
+    return faiss.StandardGpuResources()
+
+
+def _embed_texts(embeddings, texts: List[str]) -> np.ndarray:
+    """
+    Embed texts in explicit batches of EMBED_BATCH_SIZE.
+
+    Build time is dominated by embedding round-trips, not FAISS, so each
+    request carries as many chunks as the API allows, and up to
+    EMBED_CONCURRENCY requests are in flight at once.
+
+    Each batch is written straight into one preallocated (N, d) float32
+    array, the layout FAISS consumes, so the full set of vectors never
+    exists as Python lists of boxed floats.
+    """
+    batches = [texts[start:start + EMBED_BATCH_SIZE] for start in range(0, len(texts), EMBED_BATCH_SIZE)]
+    if len(batches) <= 1:
+        # A single resume fits in one request -> no thread hop
+        return np.asarray(embeddings.embed_documents(texts), dtype=np.float32)
+
+    vectors = None
+    # map() yields results in submission order, so rows stay aligned with texts
+    for i, batch_vectors in enumerate(_embed_pool.map(embeddings.embed_documents, batches)):
+        if vectors is None:
+            # d is only known once the first batch is back
+            vectors = np.empty((len(texts), len(batch_vectors[0])), dtype=np.float32)
+        start = i * EMBED_BATCH_SIZE
+        vectors[start:start + len(batch_vectors)] = batch_vectors
+    return vectors
+
+
+def _build_faiss_index(vectors: np.ndarray, exact: bool = False) -> faiss.Index:
+    """
+    Create an empty FAISS index suited to the number of vectors.
+
+    Small corpora (a single resume) use a brute-force scan. Larger ones (batch
+    mode, many resumes) switch to IVF, whose queries only scan the closest
+    clusters, then to IVF-PQ, which also stores compressed vectors, and
+    very large ones to an HNSW graph; all of these first project vectors
+    with a PCA. Trainable parts are trained on `vectors` here; the caller
+    still has to add them.
+
+    Args:
+        vectors: (N, d) float32 L2-normalised embeddings that will be stored
+        exact: Use the brute-force scan at any size (every vector is reachable)
+
+    Returns:
+        faiss.Index ready for add()
+    """
+    n, d = vectors.shape
+
+    # Inner product on normalised vectors = cosine similarity, a pure dot product per pair
+    description = "SQ8" if exact else _index_description(n, d)
+    index = faiss.index_factory(d, description, faiss.METRIC_INNER_PRODUCT)
+    if not index.is_trained:
+        index.train(vectors)
+
+    ivf = faiss.try_extract_index_ivf(index)
+    if ivf is not None:
+        ivf.nprobe = min(IVF_NPROBE, ivf.nlist)
+
+    base = base_index(index)
+    if isinstance(base, faiss.IndexHNSW):
+        # Must be set before add(): the graph is built while vectors are inserted
+        base.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+        base.hnsw.efSearch = HNSW_EF_SEARCH
+
+    return index
+
+
+def base_index(index: faiss.Index) -> faiss.Index:
+    """Return the index that stores the vectors, under any ID-map / pre-transform wrapper."""
+    while isinstance(index, (faiss.IndexIDMap, faiss.IndexIDMap2, faiss.IndexPreTransform)):
+        index = faiss.downcast_index(index.index)
+    return index
+
+
+def _index_description(n: int, d: int) -> str:
+    """faiss.index_factory string for n vectors of dimension d."""
+    if n < FLAT_INDEX_MAX_CHUNKS:
+        # Too few vectors to fit a PCA reliably (and nothing to gain)
+        return "SQ8"
+
+    # PCA is trained on the stored vectors; re-normalise after projecting
+    # so inner product stays a cosine similarity
+    prefix = ""
+    if d > PCA_DIM:
+        prefix = f"PCA{PCA_DIM},L2norm,"
+        d = PCA_DIM
+
+    nlist = int(np.sqrt(n))
+    if n < IVF_FLAT_MAX_CHUNKS or d % PQ_M != 0:
+        return f"{prefix}IVF{nlist},SQ8"
+
+    if n <= IVF_INDEX_MAX_CHUNKS:
+        return f"{prefix}IVF{nlist},PQ{PQ_M}x8"
+
+    return f"{prefix}HNSW{HNSW_M},SQ8"
+
+
 # ------------------ BUILD IN-MEMORY FAISS STORE (NO PERSISTENCE) ------------------
 
 def build_in_memory_faiss(chunks: List[Document]) -> FAISS:
@@ -116,60 +427,115 @@ def build_in_memory_faiss(chunks: List[Document]) -> FAISS:
     Returns:
         In-memory FAISS vectorstore (not saved to disk)
     """
-    embeddings = get_embedding_model()
-    vectordb = FAISS.from_documents(chunks, embeddings)
-    return vectordb
+    return build_vector_store(chunks, persist_directory=None)
 
 
 # ------------------ LOAD EXISTING FAISS STORE ------------------
 
-def load_vector_store(persist_directory: str = FAISS_DIR):
+def load_vector_store(persist_directory: str = FAISS_DIR, mmap: bool = True):
     """
     Load a previously saved FAISS index from disk.
     This avoids recomputing embeddings every time.
+
+    By default the vector data (flat / SQ8 code arrays and IVF inverted
+    lists) is memory-mapped read-only instead of being copied into RAM, so
+    opening is fast and every process that opens the same file shares the
+    OS page cache. This needs IO_FLAG_MMAP_IFC: the older IO_FLAG_MMAP only
+    maps IVF lists (flat and SQ8 codes were still copied), and the two must
+    not be combined (IVF then fails to load). Pass mmap=False to get a writable
+    in-RAM index (see update_vector_store). The docstore is unpickled from
+    index.pkl, the same file FAISS.load_local reads
+    (allow_dangerous_deserialization: only load indexes you created).
     """
 
     embeddings = get_embedding_model()
-    vectordb = FAISS.load_local(
-        persist_directory,
-        embeddings,
-        allow_dangerous_deserialization=True  # required for FAISS loading
+
+    index = faiss.read_index(
+        os.path.join(persist_directory, "index.faiss"),
+        faiss.IO_FLAG_MMAP_IFC | faiss.IO_FLAG_READ_ONLY if mmap else 0
+    )
+
+    with open(os.path.join(persist_directory, "index.pkl"), "rb") as f:
+        docstore, index_to_docstore_id = pickle.load(f)
+
+    # Indexes built by build_vector_store store unit vectors and use inner
+    # product (cosine ranking; queries need no normalising, see build_vector_store);
+    # older ones saved with the default L2 metric still load
+    cosine = index.metric_type == faiss.METRIC_INNER_PRODUCT
+
+    vectordb = FAISS(
+        embedding_function=embeddings,
+        index=index,
+        docstore=docstore,
+        index_to_docstore_id=index_to_docstore_id,
+        distance_strategy=DistanceStrategy.MAX_INNER_PRODUCT if cosine else DistanceStrategy.EUCLIDEAN_DISTANCE
     )
 
     return vectordb
 
 
-# ------------------ TEST BLOCK (runs only when executed directly) ------------------
+# ------------------ INCREMENTAL UPDATES ------------------
 
-if __name__ == "__main__":
-    """
-    Manual test:
-    1. Load the PDF
-    2. Split into chunks
-    3. Build FAISS vector DB
-    4. Run a sample similarity search query
+def update_vector_store(old_ids: List[int], new_chunks: List[Document], persist_directory: str = FAISS_DIR):
     """
+    Replace some chunks of a saved FAISS store without rebuilding it.
 
-    from pdf_loader import load_pdf_pages
-    from chunker import make_chunks
+    Typical use: a resume was edited → remove the IDs of its old chunks
+    (chunk_id() of each) and add the newly chunked text. Only the new
+    chunks are embedded; the trained index (PCA, IVF centroids) is reused.
 
-    print("Loading pages...")
-    pages = load_pdf_pages("data/Arpit_Negi_Resume.pdf")
-    print("Pages:", len(pages))
+    Args:
+        old_ids: Chunk IDs to remove (unknown IDs are ignored)
+        new_chunks: Document chunks to embed and add
+        persist_directory: Directory of the saved store; it is overwritten
 
-    print("Chunking...")
-    chunks = make_chunks(pages)
-    print("Chunks:", len(chunks))
+    Returns:
+        The updated FAISS vectorstore
+
+    Raises:
+        ValueError: If the store was not built with chunk IDs (indexes saved
+                    before build_vector_store used IndexIDMap2); rebuild it
+                    with scripts/build_index.py
+        RuntimeError: From FAISS, if the index type cannot remove vectors
+                      (the HNSW tier used for the largest corpora)
+    """
 
-    print("Building FAISS vector store...")
-    vectordb = build_vector_store(chunks)
-    print("Vector store saved!")
+    # Load fully into RAM: a memory-mapped read-only index cannot be modified
+    vectordb = load_vector_store(persist_directory, mmap=False)
+    index = vectordb.index
+
+    if not isinstance(index, (faiss.IndexIDMap, faiss.IndexIDMap2)):
+        raise ValueError(
+            f"The FAISS store in '{persist_directory}' has no chunk IDs "
+            f"({type(index).__name__}); rebuild it with scripts/build_index.py"
+        )
+
+    if old_ids:
+        index.remove_ids(np.asarray(old_ids, dtype=np.int64))
+        stale = [vectordb.index_to_docstore_id.pop(chunk_id) for chunk_id in old_ids
+                 if chunk_id in vectordb.index_to_docstore_id]
+        if stale:
+            vectordb.docstore.delete(stale)
+
+    # Chunks already in the store (same ID) are skipped, not duplicated
+    ids, chunks = _unique_chunks(new_chunks)
+    keep = [i for i, chunk_id in enumerate(ids) if int(chunk_id) not in vectordb.index_to_docstore_id]
+    ids, chunks = ids[keep], [chunks[i] for i in keep]
+
+    if chunks:
+        index.add_with_ids(_embed_chunks(_disk_cached_embedding_model(), chunks), ids)
+        vectordb.docstore.add(_docstore_entries(ids, chunks))
+        vectordb.index_to_docstore_id.update({int(chunk_id): str(chunk_id) for chunk_id in ids})
+
+    vectordb.save_local(persist_directory)
+    return vectordb
 
-    # Simple search test
-    query = "ML Developer having 3 year experience in Python and Data Science?"
-    results = vectordb.similarity_search(query, k=3)
 
-    for i, doc in enumerate(results, 1):
-        print(f"\n--- Result {i} ---")
-        print(doc.metadata)
-        print(doc.page_content[:300], "\n")
+def chunk_id(chunk: Document) -> int:
+    """
+    Stable 63-bit ID of a chunk (same text + metadata → same ID, in any process).
+
+    Python's hash() is salted per process, so XXH3 is used instead.
+    """
+    key = chunk.page_content + "\0" + repr(sorted(chunk.metadata.items()))
+    return xxhash.xxh3_64_intdigest(key.encode("utf-8")) & 0x7FFF_FFFF_FFFF_FFFF